@@ -1,14 +1,52 @@
-from flask import Flask, render_template, jsonify, request, session, redirect, url_for
+from flask import Flask, Response, render_template, request, session, redirect, url_for
 from unity_dp import UPSLibrary
+import hashlib
 import logging
+import orjson
 import os
+import threading
+import time
+
+logging.basicConfig(level=logging.INFO)
 
 app = Flask(__name__)
 app.secret_key = os.urandom(24)
 
 
+# UPSLibrary instances reused across requests, keyed by credentials: key -> (instance, last used)
+_UPS_CACHE = {}
+_UPS_CACHE_LOCK = threading.Lock()
+_UPS_CACHE_TTL = 300
+
+# One status poller per UPS host: host -> polling UPSLibrary instance
+_POLLERS = {}
+_POLLER_IDLE_TIMEOUT = 60
+
+
+def ojson(obj, status=200):
+    """Serialize a response body with orjson."""
+    return Response(orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS), status=status, mimetype='application/json')
+
+
+def _ups_cache_key(host, user, password):
+    return hashlib.sha256(f"{host}|{user}|{password}".encode()).hexdigest()
+
+
+def _status_poller(ups):
+    """Return the instance polling this UPS host, starting one if none is running (Redis only)."""
+    if not os.environ.get('UPS_REDIS_URL'):
+        return ups
+    with _UPS_CACHE_LOCK:
+        poller = _POLLERS.get(ups.host)
+        if not poller or not poller.polling:
+            # Nothing running for this host (or it went idle): poll with the requesting user's instance
+            poller = _POLLERS[ups.host] = ups
+            poller.start_background_poller(idle_timeout=_POLLER_IDLE_TIMEOUT)
+    return poller
+
+
 def get_ups_instance():
-    """Helper to get UPSLibrary instance from session credentials."""
+    """Helper to get a cached UPSLibrary instance for the session credentials."""
     host = session.get('ups_host')
     user = session.get('ups_user')
     password = session.get('ups_pass')
@@ -16,7 +54,15 @@ def get_ups_instance():
     if not host or not user or not password:
         return None
 
-    return UPSLibrary(host, user, password)
+    key = _ups_cache_key(host, user, password)
+    now = time.monotonic()
+    with _UPS_CACHE_LOCK:
+        # Drop instances nobody has used for a while
+        for k in [k for k, (_, used) in _UPS_CACHE.items() if now - used > _UPS_CACHE_TTL]:
+            del _UPS_CACHE[k]
+        ups = _UPS_CACHE[key][0] if key in _UPS_CACHE else UPSLibrary(host, user, password)
+        _UPS_CACHE[key] = (ups, now)
+    return ups
 
 
 @app.route('/')
@@ -40,12 +86,14 @@ def login():
             host = 'http://' + host
 
         # Try to connect/login to verify credentials
-        ups_test = UPSLibrary(host, user, password)
         try:
+            ups_test = UPSLibrary(host, user, password)
             if ups_test.login():
                 session['ups_host'] = host
                 session['ups_user'] = user
                 session['ups_pass'] = password
+                with _UPS_CACHE_LOCK:
+                    _UPS_CACHE[_ups_cache_key(host, user, password)] = (ups_test, time.monotonic())
                 return redirect(url_for('index'))
             else:
                 return render_template('login.html', error="Failed to login to UPS. Check credentials.")
@@ -58,6 +106,17 @@ def login():
 @app.route('/logout')
 def logout():
     """Clear the session and log out the user."""
+    host, user, password = session.get('ups_host'), session.get('ups_user'), session.get('ups_pass')
+    if host and user and password:
+        poller = None
+        with _UPS_CACHE_LOCK:
+            _UPS_CACHE.pop(_ups_cache_key(host, user, password), None)
+            # Stop the host's poller once nobody else is logged in to it
+            if not any(ups.host == host for ups, _ in _UPS_CACHE.values()):
+                poller = _POLLERS.pop(host, None)
+        # Joining waits for an in-flight poll, so do it without holding the cache lock
+        if poller:
+            poller.stop_background_poller()
     session.clear()
     return redirect(url_for('login'))
 
@@ -67,16 +126,21 @@ def get_status():
     """API endpoint to retrieve all UPS status data."""
     ups = get_ups_instance()
     if not ups:
-        return jsonify({"error": "Not logged in"}), 401
+        return ojson({"error": "Not logged in"}, 401)
 
-    if not ups.login():
-        return jsonify({"error": "Failed to login to UPS"}), 500
+    # Served straight from the host poller's snapshot when available
+    raw = _status_poller(ups).cached_status()
+    if raw:
+        return Response(raw, mimetype='application/json')
+
+    if not ups.sessACT and not ups.login():
+        return ojson({"error": "Failed to login to UPS"}, 500)
 
     try:
         data = ups.get_all_status()
-        return jsonify(data)
+        return ojson(data)
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return ojson({"error": str(e)}, 500)
 
 
 @app.route('/api/update_settings', methods=['POST'])
@@ -84,34 +148,26 @@ def update_settings():
     """API endpoint to update UPS settings."""
     ups = get_ups_instance()
     if not ups:
-        return jsonify({"error": "Not logged in"}), 401
+        return ojson({"error": "Not logged in"}, 401)
 
-    if not ups.login():
-        return jsonify({"error": "Failed to login to UPS"}), 500
+    if not ups.sessACT and not ups.login():
+        return ojson({"error": "Failed to login to UPS"}, 500)
 
     data = request.json
     try:
-        # System Settings
-        if 'site_identifier' in data:
-            ups.system.settings.site_identifier = data['site_identifier']
-        if 'site_equipment_tag' in data:
-            ups.system.settings.site_equipment_tag = data['site_equipment_tag']
-        if 'system_name' in data:
-            ups.system.settings.system_name = data['system_name']
-        if 'auto_restart' in data:
-            ups.system.settings.auto_restart = bool(data['auto_restart'])
-        if 'auto_restart_delay' in data:
-            ups.system.settings.auto_restart_delay = int(data['auto_restart_delay'])
-        if 'audible_alarm_control' in data:
-            ups.system.settings.audible_alarm_control = data['audible_alarm_control']
-
-        # Battery Settings
-        if 'low_battery_warning_time' in data:
-            ups.battery.settings.low_battery_warning_time = int(data['low_battery_warning_time'])
-
-        return jsonify({"success": True})
+        # Coerce typed fields, then map every known setting to its point
+        for name, cast in (('auto_restart', bool), ('auto_restart_delay', int), ('low_battery_warning_time', int)):
+            if name in data:
+                data[name] = cast(data[name])
+        points = {**ups.system.settings.collect_writes(data), **ups.battery.settings.collect_writes(data)}
+
+        # Send every change in one write
+        if points and not ups.set_data(points):
+            return ojson({"success": False, "error": "Failed to update settings"}, 500)
+
+        return ojson({"success": True})
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 400
+        return ojson({"success": False, "error": str(e)}, 400)
 
 
 @app.route('/api/command', methods=['POST'])
@@ -119,10 +175,10 @@ def send_command():
     """API endpoint to send commands to the UPS."""
     ups = get_ups_instance()
     if not ups:
-        return jsonify({"error": "Not logged in"}), 401
+        return ojson({"error": "Not logged in"}, 401)
 
-    if not ups.login():
-        return jsonify({"error": "Failed to login to UPS"}), 500
+    if not ups.sessACT and not ups.login():
+        return ojson({"error": "Failed to login to UPS"}, 500)
 
     data = request.json
     cmd = data.get('command')
@@ -132,39 +188,39 @@ def send_command():
         # System Commands
         if cmd == 'silence_alarm':
             ups.silence_alarm()
-            return jsonify({"success": True, "message": "Alarm silenced"})
+            return ojson({"success": True, "message": "Alarm silenced"})
         elif cmd == 'abort_command':
             ups.abort()
-            return jsonify({"success": True, "message": "Command aborted"})
+            return ojson({"success": True, "message": "Command aborted"})
         elif cmd == 'reset_power_stats':
             ups.reset_power_stats()
-            return jsonify({"success": True, "message": "Power statistics reset"})
+            return ojson({"success": True, "message": "Power statistics reset"})
 
         # Battery Commands
         elif cmd == 'battery_test':
             ups.battery_test()
-            return jsonify({"success": True, "message": "Battery test started"})
+            return ojson({"success": True, "message": "Battery test started"})
 
         # Output Commands
         elif cmd == 'output_on':
             ups.output_on(delay)
-            return jsonify({"success": True, "message": f"Output ON command sent (delay: {delay}s)"})
+            return ojson({"success": True, "message": f"Output ON command sent (delay: {delay}s)"})
         elif cmd == 'output_off':
             ups.output_off(delay)
-            return jsonify({"success": True, "message": f"Output OFF command sent (delay: {delay}s)"})
+            return ojson({"success": True, "message": f"Output OFF command sent (delay: {delay}s)"})
         elif cmd == 'output_reboot':
             ups.output_reboot(delay)
-            return jsonify({"success": True, "message": f"Output Reboot command sent (delay: {delay}s)"})
+            return ojson({"success": True, "message": f"Output Reboot command sent (delay: {delay}s)"})
 
         # Agent Commands
         elif cmd == 'restart_card':
             ups.restart_card()
-            return jsonify({"success": True, "message": "Agent Card restart command sent"})
+            return ojson({"success": True, "message": "Agent Card restart command sent"})
 
         else:
-            return jsonify({"error": "Unknown command"}), 400
+            return ojson({"error": "Unknown command"}, 400)
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return ojson({"error": str(e)}, 500)
 
 
 if __name__ == '__main__':
@@ -1,15 +1,45 @@
 import requests
 import logging
-from requests.auth import HTTPBasicAuth
-from typing import Dict, Any, Optional, Callable, Union
-
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+import base64
+import copy
+import json
+import os
+import re
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, Optional, Callable, Union, List, Tuple
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Logging configuration is left to the application
 logger = logging.getLogger(__name__)
 
+# (connect, read) timeouts for session refreshes and regular requests
+_SESSION_TIMEOUT = (2, 3)
+_REQUEST_TIMEOUT = (2, 8)
+
+# httpSet field templates for string values and numeric/command values
+_VEL_STR_TMPL = 'vel~pnt~%s~0|val~str~%s'
+_VEL_NUM_TMPL = '{0}vel~pnt~%s~0|val~num~%s'
+
+# key=value pairs of the card's ';' separated response bodies
+_KV_RE = re.compile(rb'([^=;]+)=([^;]*)')
+
 
 class Subsystem:
     """Base class for UPS subsystems providing dynamic attribute access."""
+    __slots__ = ('_ups', '_mapping', '_dev_id', '_processors', '_flat_points', '_query_all', '_point_query', '_plan')
 
     def __init__(self, ups, mapping: Dict[str, Any], dev_id: int = 0, processors: Optional[Dict[str, Callable]] = None):
         self._ups = ups
@@ -23,44 +53,70 @@ class Subsystem:
             else:
                 self._flat_points[k] = v
 
-    def get_all(self) -> Dict[str, Any]:
-        """Retrieve all defined points in their hierarchical structure."""
-        query = {v: v for v in self._flat_points.values() if isinstance(v, str) and v.startswith('v')}
-        data = self._ups.get_data(query, self._dev_id)
-        if not data: return {}
+        # Static per-subsystem queries, built once instead of on every read
+        self._query_all = {v: 'vel~pnt~' + v[1:] for v in self._flat_points.values()
+                           if isinstance(v, str) and v.startswith('v')}
+        self._point_query = {name: {pnt: 'vel~pnt~' + pnt[1:]} for name, pnt in self._flat_points.items()
+                             if isinstance(pnt, str) and pnt.startswith('v')}
 
-        def process_dict(d):
-            res = {}
+        # Flat (path, point, processor) walk of the mapping used to assemble get_all results
+        self._plan: List[Tuple[Tuple[str, ...], str, Optional[Callable]]] = []
+
+        def build_plan(d, path):
             for k, v in d.items():
                 if isinstance(v, dict):
-                    res[k] = process_dict(v)
+                    build_plan(v, path + (k,))
                 else:
-                    val = data.get(v, '--' if data.get(v) == 'No Support' else data.get(v))
-                    if k in self._processors: val = self._processors[k](val, res)
-                    res[k] = val
-            return res
+                    self._plan.append((path + (k,), v, self._processors.get(k)))
+
+        build_plan(mapping, ())
 
-        return process_dict(self._mapping)
+    def get_all(self) -> Dict[str, Any]:
+        """Retrieve all defined points in their hierarchical structure."""
+        data = self._ups.get_data(self._query_all, self._dev_id)
+        if not data: return {}
+        return self._assemble_from_data(data)
+
+    def _assemble_from_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the hierarchical result for this subsystem from an already fetched response."""
+        res = {}
+        for path, pnt, processor in self._plan:
+            parent = res
+            for key in path[:-1]: parent = parent.setdefault(key, {})
+            val = data.get(pnt, '--')
+            if val == 'No Support': val = '--'
+            if processor: val = processor(val, parent)
+            parent[path[-1]] = val
+        return res
 
     def _get_point(self, name: str) -> Any:
         if name in self._flat_points:
             pnt = self._flat_points[name]
-            data = self._ups.get_data({pnt: pnt}, self._dev_id)
+            data = self._ups.get_data(self._point_query.get(name, {pnt: pnt}), self._dev_id)
             val = data.get(pnt) if data else None
             if val == 'No Support': val = '--'
             if name in self._processors: val = self._processors[name](val, {})
             return val
         raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
 
+    def collect_writes(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map field names known to this subsystem to their point ids, ready for a single set_data call."""
+        out = {}
+        for name, value in data.items():
+            if name not in self._flat_points: continue
+            if isinstance(value, bool): value = 1 if value else 0
+            out[self._flat_points[name]] = value
+        return out
+
     def _set_point(self, name: str, value: Any):
         if name in self._flat_points:
-            if isinstance(value, bool): value = 1 if value else 0
-            self._ups.set_data({self._flat_points[name]: value}, self._dev_id)
+            self._ups.set_data(self.collect_writes({name: value}), self._dev_id)
         else:
             raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
 
     def __getattr__(self, name: str) -> Any:
         # Fallback for flat access or categories if not explicitly defined
+        if name.startswith('_'): raise AttributeError(name)
         if name in self._flat_points: return self._get_point(name)
         if name in self._mapping and isinstance(self._mapping[name], dict):
             return Subsystem(self._ups, self._mapping[name], self._dev_id, self._processors)
@@ -71,140 +127,138 @@ def point_prop(name: str):
     return property(lambda self: self._get_point(name), lambda self, v: self._set_point(name, v))
 
 
+def subsystem_points(cls):
+    """Install a point_prop descriptor for every name listed in the class's POINTS."""
+    for name in cls.__dict__.get('POINTS', ()):
+        setattr(cls, name, point_prop(name))
+    return cls
+
+
+@subsystem_points
 class SystemStatus(Subsystem):
-    firmware_version = point_prop('firmware_version')
-    manufacturer = point_prop('manufacturer')
-    model_number = point_prop('model_number')
-    serial_number = point_prop('serial_number')
-    manufacture_date = point_prop('manufacture_date')
-    inlet_temperature = point_prop('inlet_temperature')
-    ups_topology = point_prop('ups_topology')
-    ups_source = point_prop('ups_source')
-    black_out_count = point_prop('black_out_count')
-    brown_out_count = point_prop('brown_out_count')
-    system_name = point_prop('system_name')
+    __slots__ = ()
+    POINTS = [
+        'firmware_version', 'manufacturer', 'model_number', 'serial_number', 'manufacture_date',
+        'inlet_temperature', 'ups_topology', 'ups_source', 'black_out_count', 'brown_out_count',
+        'system_name'
+    ]
 
 
+@subsystem_points
 class SystemSettings(Subsystem):
-    site_identifier = point_prop('site_identifier')
-    site_equipment_tag = point_prop('site_equipment_tag')
-    system_name = point_prop('system_name')
-    auto_restart = point_prop('auto_restart')
-    auto_restart_delay = point_prop('auto_restart_delay')
-    audible_alarm_control = point_prop('audible_alarm_control')
+    __slots__ = ()
+    POINTS = [
+        'site_identifier', 'site_equipment_tag', 'system_name', 'auto_restart', 'auto_restart_delay',
+        'audible_alarm_control'
+    ]
 
 
+@subsystem_points
 class SystemSubsystem(Subsystem):
-    @property
-    def status(self) -> SystemStatus: return SystemStatus(self._ups, self._mapping['status'], self._dev_id,
-                                                          self._processors)
+    __slots__ = ('status', 'event', 'settings')
+    status: SystemStatus
+    event: Subsystem
+    settings: SystemSettings
 
-    @property
-    def event(self) -> Subsystem: return Subsystem(self._ups, self._mapping['event'], self._dev_id, self._processors)
+    POINTS = ['firmware_version', 'site_identifier']
 
-    @property
-    def settings(self) -> SystemSettings: return SystemSettings(self._ups, self._mapping['settings'], self._dev_id,
-                                                                self._processors)
-
-    firmware_version = point_prop('firmware_version')
-    site_identifier = point_prop('site_identifier')
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.status = SystemStatus(self._ups, self._mapping['status'], self._dev_id, self._processors)
+        self.event = Subsystem(self._ups, self._mapping['event'], self._dev_id, self._processors)
+        self.settings = SystemSettings(self._ups, self._mapping['settings'], self._dev_id, self._processors)
 
 
+@subsystem_points
 class BatteryStatus(Subsystem):
-    charge = point_prop('charge')
-    time_remaining = point_prop('time_remaining')
-    charge_status = point_prop('charge_status')
-    dc_bus_voltage = point_prop('dc_bus_voltage')
-    charger_state = point_prop('charger_state')
-    test_result = point_prop('test_result')
-    status = point_prop('status')
+    __slots__ = ()
+    POINTS = ['charge', 'time_remaining', 'charge_status', 'dc_bus_voltage', 'charger_state', 'test_result', 'status']
 
 
+@subsystem_points
 class BatterySettings(Subsystem):
-    low_battery_warning_time = point_prop('low_battery_warning_time')
+    __slots__ = ()
+    POINTS = ['low_battery_warning_time']
 
 
+@subsystem_points
 class BatterySubsystem(Subsystem):
-    @property
-    def status(self) -> BatteryStatus: return BatteryStatus(self._ups, self._mapping['status'], self._dev_id,
-                                                            self._processors)
+    __slots__ = ('status', 'event', 'settings')
+    status: BatteryStatus
+    event: Subsystem
+    settings: BatterySettings
 
-    @property
-    def event(self) -> Subsystem: return Subsystem(self._ups, self._mapping['event'], self._dev_id, self._processors)
+    POINTS = ['charge', 'time_remaining']
 
-    @property
-    def settings(self) -> BatterySettings: return BatterySettings(self._ups, self._mapping['settings'], self._dev_id,
-                                                                  self._processors)
-
-    charge = point_prop('charge')
-    time_remaining = point_prop('time_remaining')
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.status = BatteryStatus(self._ups, self._mapping['status'], self._dev_id, self._processors)
+        self.event = Subsystem(self._ups, self._mapping['event'], self._dev_id, self._processors)
+        self.settings = BatterySettings(self._ups, self._mapping['settings'], self._dev_id, self._processors)
 
 
+@subsystem_points
 class InputStatus(Subsystem):
-    voltage_ln = point_prop('voltage_ln')
-    current_amps = point_prop('current_amps')
-    frequency_hz = point_prop('frequency_hz')
-    max_voltage_ln = point_prop('max_voltage_ln')
-    min_voltage_ln = point_prop('min_voltage_ln')
-    nominal_voltage = point_prop('nominal_voltage')
+    __slots__ = ()
+    POINTS = ['voltage_ln', 'current_amps', 'frequency_hz', 'max_voltage_ln', 'min_voltage_ln', 'nominal_voltage']
 
 
+@subsystem_points
 class InputSubsystem(Subsystem):
-    @property
-    def status(self) -> InputStatus: return InputStatus(self._ups, self._mapping['status'], self._dev_id,
-                                                        self._processors)
+    __slots__ = ('status', 'event')
+    status: InputStatus
+    event: Subsystem
 
-    @property
-    def event(self) -> Subsystem: return Subsystem(self._ups, self._mapping['event'], self._dev_id, self._processors)
+    POINTS = ['voltage_ln']
 
-    voltage_ln = point_prop('voltage_ln')
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.status = InputStatus(self._ups, self._mapping['status'], self._dev_id, self._processors)
+        self.event = Subsystem(self._ups, self._mapping['event'], self._dev_id, self._processors)
 
 
+@subsystem_points
 class OutputStatus(Subsystem):
-    voltage_ln = point_prop('voltage_ln')
-    amps = point_prop('amps')
-    watts = point_prop('watts')
-    va = point_prop('va')
-    load_percent = point_prop('load_percent')
-    pf = point_prop('pf')
-    frequency = point_prop('frequency')
+    __slots__ = ()
+    POINTS = ['voltage_ln', 'amps', 'watts', 'va', 'load_percent', 'pf', 'frequency']
 
 
+@subsystem_points
 class OutputSubsystem(Subsystem):
-    @property
-    def status(self) -> OutputStatus: return OutputStatus(self._ups, self._mapping['status'], self._dev_id,
-                                                          self._processors)
+    __slots__ = ('status', 'event')
+    status: OutputStatus
+    event: Subsystem
 
-    @property
-    def event(self) -> Subsystem: return Subsystem(self._ups, self._mapping['event'], self._dev_id, self._processors)
+    POINTS = ['voltage_ln', 'load_percent']
 
-    voltage_ln = point_prop('voltage_ln')
-    load_percent = point_prop('load_percent')
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.status = OutputStatus(self._ups, self._mapping['status'], self._dev_id, self._processors)
+        self.event = Subsystem(self._ups, self._mapping['event'], self._dev_id, self._processors)
 
 
+@subsystem_points
 class BypassSubsystem(Subsystem):
-    bypass_voltage = point_prop('bypass_voltage')
-    bypass_current = point_prop('bypass_current')
-    bypass_frequency = point_prop('bypass_frequency')
-    bypass_nominal_voltage = point_prop('bypass_nominal_voltage')
-    bypass_not_available = point_prop('bypass_not_available')
+    __slots__ = ()
+    POINTS = ['bypass_voltage', 'bypass_current', 'bypass_frequency', 'bypass_nominal_voltage', 'bypass_not_available']
 
 
+@subsystem_points
 class AgentStatus(Subsystem):
-    model = point_prop('model')
-    firmware_version = point_prop('firmware_version')
-    firmware_label = point_prop('firmware_label')
-    date_time = point_prop('date_time')
+    __slots__ = ()
+    POINTS = ['model', 'firmware_version', 'firmware_label', 'date_time']
 
 
+@subsystem_points
 class AgentSubsystem(Subsystem):
-    @property
-    def status(self) -> AgentStatus: return AgentStatus(self._ups, self._mapping['status'], self._dev_id)
+    __slots__ = ('status',)
+    status: AgentStatus
+
+    POINTS = ['model', 'firmware_version', 'firmware_label', 'date_time']
 
-    model = point_prop('model')
-    firmware_version = point_prop('firmware_version')
-    firmware_label = point_prop('firmware_label')
-    date_time = point_prop('date_time')
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.status = AgentStatus(self._ups, self._mapping['status'], self._dev_id)
 
 
 class UPSLibrary:
@@ -216,14 +270,76 @@ class UPSLibrary:
     bypass: BypassSubsystem
     agent: AgentSubsystem
 
-    def __init__(self, host, username, password):
+    def __init__(self, host, username, password, http2=False):
         self.host = host.rstrip('/')
         self.username = username
         self.password = password
-        self.session = requests.Session()
+        self.session = None
+        try:
+            self._auth_header = 'Basic ' + base64.b64encode(f'{username}:{password}'.encode('latin-1')).decode()
+        except UnicodeEncodeError:
+            # Basic auth credentials must be latin-1; login() reports the failure
+            self._auth_header = None
+        auth_headers = {'Authorization': self._auth_header} if self._auth_header else {}
+        self._session_timeout, self._request_timeout = _SESSION_TIMEOUT, _REQUEST_TIMEOUT
+
+        # Opt-in HTTP/2 client; falls back to requests when httpx (or its h2 extra) is unavailable
+        if http2:
+            if httpx is None:
+                logger.warning("HTTP/2 requested but httpx is not installed, using requests")
+            else:
+                try:
+                    self.session = httpx.Client(http2=True, http1=True, headers=auth_headers,
+                                                limits=httpx.Limits(max_keepalive_connections=8),
+                                                follow_redirects=True, default_encoding='latin-1')
+                    self._session_timeout = httpx.Timeout(_SESSION_TIMEOUT[1], connect=_SESSION_TIMEOUT[0])
+                    self._request_timeout = httpx.Timeout(_REQUEST_TIMEOUT[1], connect=_REQUEST_TIMEOUT[0])
+                except ImportError as e:
+                    logger.warning("HTTP/2 unavailable (%s), using requests", e)
+
+        if self.session is None:
+            self.session = requests.Session()
+
+            # Keep connections to the card alive and shared across threads. Only idempotent GETs are retried
+            # so commands are never sent twice, and an unreachable card fails on the first connect timeout.
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                                  max_retries=Retry(total=2, connect=0, backoff_factor=0.2,
+                                                    status_forcelist=[502, 503, 504],
+                                                    allowed_methods=frozenset({'GET'})))
+            self.session.mount('http://', adapter)
+            self.session.mount('https://', adapter)
+            self.session.headers.update({'Connection': 'keep-alive', **auth_headers})
+
         self.sessACT = None
+        self._sessACT_at = 0.0
+        self._sessACT_ttl = 60
+        # Serializes login/refresh so concurrent requests never race for a new token
+        self._session_lock = threading.RLock()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='ups-fetch')
         self.devId = 4
 
+        # Optional shared status cache, enabled by UPS_REDIS_URL
+        self._cache = None
+        self._cache_ttl = 2
+        self._cache_lock_timeout = 10
+        self._poller = None
+        self._poller_stop = threading.Event()
+        self._last_read_at = 0.0
+        redis_url = os.environ.get('UPS_REDIS_URL')
+        if redis_url:
+            if redis is None:
+                logger.warning("UPS_REDIS_URL is set but the redis package is not installed")
+            else:
+                self._cache = redis.Redis.from_url(redis_url)
+
+        # Cheap probe points (event counters, source, battery state and charge) used as a pseudo-ETag
+        self._status_etag_points = ['v4120', 'v4119', 'v4872', 'v4871', 'v4153']
+        self._status_etag_query = {p: 'vel~pnt~' + p[1:] for p in self._status_etag_points}
+        self._status_max_age = 30
+        self._last_etag = None
+        self._last_status = None
+        self._last_status_at = 0.0
+
         # Value processors for special fields
         source_map = {'1': 'Other', '3': 'Normal', '6': 'Normal', '7': 'Normal', '4': 'Bypass', '5': 'Battery'}
         proc_source = lambda v, res: source_map.get(v, f"Unknown ({v})") if v and v != '--' else v
@@ -290,45 +406,68 @@ class UPSLibrary:
 
     def login(self):
         """Authenticate and get session token."""
-        try:
-            resp = self.session.get(f"{self.host}/protected/session/unityLogin.htm",
-                                    auth=HTTPBasicAuth(self.username, self.password), params={'devId': self.devId},
-                                    timeout=10)
-            if resp.status_code == 200:
-                for item in resp.text.split(';'):
-                    if item.startswith('sessACT='):
-                        self.sessACT = item.split('=')[1]
-                        return True
-        except Exception as e:
-            logger.error(f"Login error: {e}")
+        if not self._auth_header:
+            logger.error("Login error: username and password must be latin-1 encodable")
+            return False
+        with self._session_lock:
+            try:
+                resp = self.session.get(f"{self.host}/protected/session/unityLogin.htm",
+                                        params={'devId': self.devId}, timeout=self._request_timeout)
+                if resp.status_code == 200 and self._update_sessACT(resp): return True
+            except Exception as e:
+                logger.error("Login error: %s", e)
+            return False
+
+    def _update_sessACT(self, resp):
+        """Pick up a (possibly rotated) session token from a response body."""
+        for m in _KV_RE.finditer(resp.content):
+            if m.group(1) == b'sessACT':
+                self.sessACT = m.group(2).decode(resp.encoding or 'latin-1', 'replace')
+                self._sessACT_at = time.monotonic()
+                return True
         return False
 
+    def _ensure_session(self):
+        """Log in, or refresh a stale token, with only one thread talking to the session endpoints."""
+        with self._session_lock:
+            if not self.sessACT: return self.login()
+
+            # Only refresh the session once the last seen token has gone stale
+            if time.monotonic() - self._sessACT_at > self._sessACT_ttl:
+                try:
+                    r = self.session.get(f"{self.host}/protected/session/getSessionInfo.htm",
+                                         params={'devId': self.devId, 'sessACT': self.sessACT, 'action': 0},
+                                         timeout=self._session_timeout)
+                    if r.status_code == 200: self._update_sessACT(r)
+                except:
+                    pass
+            return True
+
+    def _renew_session(self, rejected):
+        """Log in again after `rejected` was refused, unless another thread already replaced it."""
+        with self._session_lock:
+            return self.sessACT != rejected or self.login()
+
     def _request(self, method, path, **kwargs):
-        if not self.sessACT and not self.login(): return None
+        if not self._ensure_session(): return None
 
-        # Proactive refresh
-        try:
-            r = self.session.get(f"{self.host}/protected/session/getSessionInfo.htm",
-                                 auth=HTTPBasicAuth(self.username, self.password),
-                                 params={'devId': self.devId, 'sessACT': self.sessACT, 'action': 0}, timeout=5)
-            if r.status_code == 200:
-                for part in r.text.split(';'):
-                    if part.startswith('sessACT='): self.sessACT = part.split('=')[1]
-        except:
-            pass
-
-        kwargs.update({'auth': HTTPBasicAuth(self.username, self.password), 'timeout': 10})
-        if 'params' in kwargs: kwargs['params']['sessACT'] = self.sessACT
-        if 'data' in kwargs: kwargs['data']['sessACT'] = self.sessACT
+        kwargs['timeout'] = self._request_timeout
+        for attempt in range(2):
+            token = self.sessACT
+            if 'params' in kwargs: kwargs['params']['sessACT'] = token
+            if 'data' in kwargs: kwargs['data']['sessACT'] = token
+
+            try:
+                resp = self.session.request(method, f"{self.host}{path}", **kwargs)
+            except Exception as e:
+                logger.error("Request error: %s", e)
+                return None
 
-        try:
-            resp = self.session.request(method, f"{self.host}{path}", **kwargs)
             if resp.status_code == 200:
-                for part in resp.text.split(';'):
-                    if part.startswith('sessACT='): self.sessACT = part.split('=')[1]
+                self._update_sessACT(resp)
                 return resp
-        except Exception as e:
-            logger.error(f"Request error: {e}")
+            # A rejected request means the session expired; log in again and retry once
+            if resp.status_code not in (401, 403) or attempt or not self._renew_session(token): return None
         return None
 
     def get_data(self, points, devId=None):
@@ -343,35 +482,166 @@ class UPSLibrary:
         if not resp: return {}
         
         # Parse response and normalize keys back to v1234
+        # Decode like resp.text would: declared charset, else ISO-8859-1
+        encoding = resp.encoding or 'latin-1'
         res = {}
-        for part in resp.text.split(';'):
-            if '=' in part:
-                k, v = part.split('=', 1)
-                v = v.strip('"')
-                if k.startswith('val') and k.endswith('_0'):
-                    res[f"v{k[3:-2]}"] = v
-                else:
-                    res[k] = v
+        for m in _KV_RE.finditer(resp.content):
+            k, v = m.group(1).decode(encoding, 'replace'), m.group(2).strip(b'"').decode(encoding, 'replace')
+            if k.startswith('val') and k.endswith('_0'):
+                res[f"v{k[3:-2]}"] = v
+            else:
+                res[k] = v
         return res
 
     def set_data(self, points, devId=0):
+        """Write all points in a single httpSet envelope."""
+        data = {'devId': devId, 'begin': 'http~set~begin'}
         for k, v in points.items():
             pnt_id = k[1:] if k.startswith('v') else k
             v_str = str(v)
             is_cmd = '!~' in v_str
-            prefix = "commBtn" if is_cmd or not isinstance(v, str) else "str"
+            is_num = is_cmd or not isinstance(v, str)
             val = v_str.split('!~')[0] if is_cmd else v
+            tmpl, prefix = (_VEL_NUM_TMPL, 'commBtn') if is_num else (_VEL_STR_TMPL, 'str')
+            data[prefix + pnt_id] = tmpl % (pnt_id, val)
+        data['end'] = 'http~set~end'
 
-            pnt_val = f'vel~pnt~{pnt_id}~0|val~{"num" if prefix == "commBtn" else "str"}~{val}'
-            if prefix == "commBtn": pnt_val = f'{{0}}{pnt_val}'
-
-            data = {'devId': devId, 'begin': 'http~set~begin', f'{prefix}{pnt_id}': pnt_val, 'end': 'http~set~end'}
-            if not self._request('POST', '/protected/httpSet.htm', data=data): return False
+        if not self._request('POST', '/protected/httpSet.htm', data=data): return False
+        self.invalidate_status_cache()
         return True
 
     # High-level API (Simplified)
+    @property
+    def _status_cache_key(self):
+        return f"ups:{self.host}:{self.devId}:status"
+
+    def invalidate_status_cache(self):
+        """Drop the cached status snapshot so the next read goes to the UPS."""
+        self._last_etag = None
+        if not self._cache: return
+        try:
+            self._cache.delete(self._status_cache_key)
+        except redis.RedisError as e:
+            logger.warning("Cache error: %s", e)
+
+    def _store_status(self, data, ttl):
+        try:
+            self._cache.setex(self._status_cache_key, ttl, json.dumps(data))
+        except redis.RedisError as e:
+            logger.warning("Cache error: %s", e)
+
+    def cached_status(self):
+        """Return the cached status snapshot as raw JSON bytes, or None if nothing is cached."""
+        if not self._cache: return None
+        self._last_read_at = time.monotonic()
+        try:
+            return self._cache.get(self._status_cache_key)
+        except redis.RedisError as e:
+            logger.warning("Cache error: %s", e)
+        return None
+
     def get_all_status(self):
-        return {s: getattr(self, s).get_all() for s in ['system', 'battery', 'input', 'output', 'bypass', 'agent']}
+        if not self._cache: return self.get_all_status_batched()
+
+        cached = self.cached_status()
+        if cached: return json.loads(cached)
+
+        # Only the caller holding the lock goes to the UPS; concurrent misses wait for its snapshot
+        lock_key = self._status_cache_key + ':lock'
+        try:
+            leader = self._cache.set(lock_key, 1, nx=True, ex=self._cache_lock_timeout)
+            if not leader:
+                deadline = time.monotonic() + self._cache_lock_timeout
+                while time.monotonic() < deadline:
+                    time.sleep(0.05)
+                    cached = self.cached_status()
+                    if cached: return json.loads(cached)
+                    if not self._cache.exists(lock_key): break
+        except redis.RedisError as e:
+            logger.warning("Cache error: %s", e)
+            leader = False
+
+        try:
+            data = self.get_all_status_batched()
+            # Never share a failed fetch with other dashboards
+            if any(data.values()): self._store_status(data, self._cache_ttl)
+        finally:
+            if leader:
+                try:
+                    self._cache.delete(lock_key)
+                except redis.RedisError as e:
+                    logger.warning("Cache error: %s", e)
+        return data
+
+    def get_all_status_if_changed(self):
+        """Probe a few counters and only refetch everything when they moved or the snapshot is too old.
+
+        Returns a copy of the stored snapshot, so callers may modify the result.
+        """
+        probe = self.get_data(self._status_etag_query, self.system._dev_id)
+        if not probe:
+            # The card just failed to answer; do not pay the timeout again for the full fetch
+            return copy.deepcopy(self._last_status) if self._last_status is not None else {}
+
+        etag = hash(tuple(probe.get(p) for p in self._status_etag_points))
+        if (etag != self._last_etag or self._last_status is None
+                or time.monotonic() - self._last_status_at >= self._status_max_age):
+            data = self.get_all_status_batched()
+            self._last_etag, self._last_status, self._last_status_at = etag, data, time.monotonic()
+        return copy.deepcopy(self._last_status)
+
+    def start_background_poller(self, interval=1.0, idle_timeout=None):
+        """Keep the status cache warm by polling the UPS from a daemon thread.
+
+        With idle_timeout set, the poller stops itself once cached_status() has not been called for that long.
+        """
+        if not self._cache:
+            logger.warning("Background polling needs a status cache, set UPS_REDIS_URL")
+            return False
+        if self.polling: return True
+
+        self._poller_stop.clear()
+        self._last_read_at = time.monotonic()
+        self._poller = threading.Thread(target=self._poll_loop, args=(interval, idle_timeout),
+                                        name=f"ups-poller-{self.host}", daemon=True)
+        self._poller.start()
+        return True
+
+    @property
+    def polling(self):
+        return bool(self._poller and self._poller.is_alive())
+
+    def stop_background_poller(self):
+        self._poller_stop.set()
+        if self._poller and self._poller is not threading.current_thread(): self._poller.join()
+
+    def _poll_loop(self, interval, idle_timeout):
+        # Let entries outlive a couple of missed polls so readers do not fall through to the UPS
+        ttl = max(self._cache_ttl, int(interval * 3) + 1)
+        while not self._poller_stop.is_set():
+            if idle_timeout and time.monotonic() - self._last_read_at > idle_timeout:
+                logger.info("Stopping idle status poller for %s", self.host)
+                return
+            try:
+                data = self.get_all_status_batched()
+                if any(data.values()): self._store_status(data, ttl)
+            except Exception as e:
+                logger.error("Poller error: %s", e)
+            self._poller_stop.wait(interval)
+
+    def get_all_status_batched(self):
+        """Fetch every subsystem with one concurrent GET per device id and dispatch the shared response."""
+        subsystems = {s: getattr(self, s) for s in ['system', 'battery', 'input', 'output', 'bypass', 'agent']}
+        merged: Dict[int, Dict[str, str]] = {}
+        for sub in subsystems.values():
+            merged.setdefault(sub._dev_id, {}).update(sub._query_all)
+
+        # Settle the session up front so the concurrent device queries share one token
+        if not self._ensure_session(): return {s: {} for s in subsystems}
+        futures = {dev_id: self._executor.submit(self.get_data, query, dev_id) for dev_id, query in merged.items()}
+        data = {dev_id: f.result() for dev_id, f in futures.items()}
+        return {s: sub._assemble_from_data(data[sub._dev_id]) if data[sub._dev_id] else {}
+                for s, sub in subsystems.items()}
 
     def battery_test(self):
         return self.set_data({'v5858': '1!~Start Test'})